@@ -1,17 +1,144 @@
 import logging
-from typing import List
+import math
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.decorator import cache
+import orjson
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.crud import address as crud
 from app.db.database import get_db
-from app.models.address import AddressResponse, AddressCreate, AddressUpdate, AddressWithDistance, LocationQuery
+from app.models.address import AddressResponse, AddressCreate, AddressUpdate, AddressWithDistance
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# List responses are validated and serialized by these adapters in a single
+# pydantic-core call each, instead of FastAPI's per-item response_model pass.
+ADDRESS_LIST_ADAPTER = TypeAdapter(List[AddressResponse])
+NEARBY_LIST_ADAPTER = TypeAdapter(List[AddressWithDistance])
+
+
+class RawJSONResponse(JSONResponse):
+    """JSON response whose content is already encoded"""
+
+    def render(self, content: bytes) -> bytes:
+        return content
+
+
+# Cached responses of the read-only address routes live under this namespace
+# and are dropped whenever an address is created, updated or deleted.
+CACHE_NAMESPACE = "addresses"
+CACHE_EXPIRE_SECONDS = 60
+NEARBY_CACHE_EXPIRE_SECONDS = 30
+
+# Nearby candidates are cached per ~110 m grid cell of the reference point
+# and per 0.5 km radius step, so nearby requests share entries. Searching
+# from the cell centre with the radius padded by the cell's half-diagonal
+# (about 79 m) covers every reference point in the cell.
+NEARBY_COORDINATE_DECIMALS = 3
+NEARBY_RADIUS_STEP_KM = 0.5
+NEARBY_CELL_HALF_DIAGONAL_KM = 0.08
+
+# Nearby results may also be cached by browsers and proxies for as long
+NEARBY_CACHE_HEADERS = {"Cache-Control": f"public, max-age={NEARBY_CACHE_EXPIRE_SECONDS}"}
+
+
+def addresses_key_builder(
+        func,
+        namespace: str = "",
+        request=None,
+        response=None,
+        args=(),
+        kwargs=None
+) -> str:
+    return (
+        f"{FastAPICache.get_prefix()}:{namespace}:list:"
+        f"skip={kwargs['skip']}:limit={kwargs['limit']}"
+    )
+
+
+def address_key_builder(
+        func,
+        namespace: str = "",
+        request=None,
+        response=None,
+        args=(),
+        kwargs=None
+) -> str:
+    return f"{FastAPICache.get_prefix()}:{namespace}:id={kwargs['address_id']}"
+
+
+def nearby_key_builder(cell_lat: float, cell_lon: float, cell_radius_km: float) -> str:
+    return (
+        f"{FastAPICache.get_prefix()}:{CACHE_NAMESPACE}:nearby:"
+        f"lat={cell_lat:.{NEARBY_COORDINATE_DECIMALS}f}:"
+        f"lon={cell_lon:.{NEARBY_COORDINATE_DECIMALS}f}:"
+        f"r={cell_radius_km:.1f}"
+    )
+
+
+async def get_cached(key: str) -> Optional[bytes]:
+    try:
+        return await FastAPICache.get_backend().get(key)
+    except Exception as e:
+        logger.warning("Error reading cache key %s: %s", key, e)
+        return None
+
+
+async def set_cached(key: str, value: bytes, expire: int):
+    try:
+        await FastAPICache.get_backend().set(key, value, expire)
+    except Exception as e:
+        logger.warning("Error writing cache key %s: %s", key, e)
+
+
+async def get_nearby_candidates(
+        db: Session,
+        lat: float,
+        lon: float,
+        radius_km: float
+) -> List[dict]:
+    """
+    Addresses that may lie within radius_km of (lat, lon). The set only
+    depends on the grid cell of the point and the radius step, so it is
+    cached and shared by every request falling into them; callers rank it
+    by their exact distance.
+    """
+    cell_lat = round(lat, NEARBY_COORDINATE_DECIMALS)
+    cell_lon = round(lon, NEARBY_COORDINATE_DECIMALS)
+    cell_radius_km = math.ceil(radius_km / NEARBY_RADIUS_STEP_KM) * NEARBY_RADIUS_STEP_KM
+    cache_key = nearby_key_builder(cell_lat, cell_lon, cell_radius_km)
+
+    content = await get_cached(cache_key)
+    if content is None:
+        results = crud.get_addresses_within_radius(
+            db=db,
+            latitude=cell_lat,
+            longitude=cell_lon,
+            radius_km=cell_radius_km + NEARBY_CELL_HALF_DIAGONAL_KM
+        )
+        content = ADDRESS_LIST_ADAPTER.dump_json(ADDRESS_LIST_ADAPTER.validate_python(
+            [address for address, _ in results], from_attributes=True
+        ))
+        await set_cached(cache_key, content, NEARBY_CACHE_EXPIRE_SECONDS)
+    return orjson.loads(content)
+
+
+async def invalidate_cache():
+    if not FastAPICache.get_enable():
+        return
+    try:
+        await FastAPICache.clear(namespace=CACHE_NAMESPACE)
+    except Exception as e:
+        logger.warning("Error clearing address cache: %s", e)
+
+
 @router.post(
     "/addresses",
     response_model=AddressResponse,
@@ -22,19 +149,44 @@ async def create_address(
         db: Session = Depends(get_db)
 ):
     try:
-        return crud.create_address(db=db, address=address)
+        db_address = crud.create_address(db=db, address=address)
     except Exception as e:
-        logger.error(f"Error creating address: {e}")
+        logger.error("Error creating address: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create address"
         )
+    await invalidate_cache()
+    return db_address
+
+
+@router.post(
+    "/addresses/bulk",
+    response_model=List[int],
+    status_code=status.HTTP_201_CREATED
+)
+async def create_addresses_bulk(
+        addresses: List[AddressCreate],
+        db: Session = Depends(get_db)
+):
+    try:
+        address_ids = crud.create_addresses_bulk(db=db, addresses=addresses)
+    except Exception as e:
+        logger.error("Error creating addresses in bulk: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create addresses"
+        )
+    await invalidate_cache()
+    return address_ids
 
 
 @router.get(
     "/addresses",
-    response_model=List[AddressResponse]
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": List[AddressResponse]}}
 )
+@cache(expire=CACHE_EXPIRE_SECONDS, namespace=CACHE_NAMESPACE, key_builder=addresses_key_builder)
 async def get_addresses(
         skip: int = Query(0, ge=0, description="Number of records to skip"),
         limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
@@ -42,31 +194,99 @@ async def get_addresses(
 ):
     try:
         addresses = crud.get_addresses(db=db, skip=skip, limit=limit)
-        return addresses
+        return RawJSONResponse(ADDRESS_LIST_ADAPTER.dump_json(
+            ADDRESS_LIST_ADAPTER.validate_python(addresses, from_attributes=True)
+        ))
     except Exception as e:
-        logger.error(f"Error fetching addresses: {e}")
+        logger.error("Error fetching addresses: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch addresses"
         )
 
 
+@router.get(
+    "/addresses/nearby",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": List[AddressWithDistance]}}
+)
+async def get_nearby_addresses(
+        lat: float = Query(..., ge=-90, le=90, description="Reference latitude"),
+        lon: float = Query(..., ge=-180, le=180, description="Reference longitude"),
+        radius_km: float = Query(..., gt=0, description="Search radius in kilometers"),
+        limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of closest addresses to return"),
+        db: Session = Depends(get_db)
+):
+    try:
+        if FastAPICache.get_enable():
+            candidates = await get_nearby_candidates(db, lat, lon, radius_km)
+            ranked = crud.rank_within_radius(
+                [candidate["latitude"] for candidate in candidates],
+                [candidate["longitude"] for candidate in candidates],
+                latitude=lat,
+                longitude=lon,
+                radius_km=radius_km,
+                limit=limit
+            )
+            addresses_with_distance = [
+                {**candidates[index], "distance_km": round(distance, 2)}
+                for index, distance in ranked
+            ]
+        else:
+            results = crud.get_addresses_within_radius(
+                db=db,
+                latitude=lat,
+                longitude=lon,
+                radius_km=radius_km,
+                limit=limit
+            )
+
+            addresses_with_distance = []
+            for address, distance in results:
+                addresses_with_distance.append({
+                    "id": address.id,
+                    "street": address.street,
+                    "city": address.city,
+                    "state": address.state,
+                    "country": address.country,
+                    "postal_code": address.postal_code,
+                    "latitude": address.latitude,
+                    "longitude": address.longitude,
+                    "created_at": address.created_at,
+                    "updated_at": address.updated_at,
+                    "distance_km": round(distance, 2)
+                })
+    except Exception as e:
+        logger.error("Error finding nearby addresses: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to find nearby addresses"
+        )
+
+    return RawJSONResponse(
+        NEARBY_LIST_ADAPTER.dump_json(NEARBY_LIST_ADAPTER.validate_python(addresses_with_distance)),
+        headers=NEARBY_CACHE_HEADERS
+    )
+
+
+# Registered after /addresses/nearby, which would otherwise match as an ID
 @router.get(
     "/addresses/{address_id}",
     response_model=AddressResponse
 )
+@cache(expire=CACHE_EXPIRE_SECONDS, namespace=CACHE_NAMESPACE, key_builder=address_key_builder)
 async def get_address(
         address_id: int,
         db: Session = Depends(get_db)
 ):
     db_address = crud.get_address(db=db, address_id=address_id)
     if db_address is None:
-        logger.warning(f"Address with ID {address_id} not found")
+        logger.warning("Address with ID %s not found", address_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Address with ID {address_id} not found"
         )
-    return db_address
+    return AddressResponse.model_validate(db_address)
 
 
 @router.put(
@@ -84,11 +304,12 @@ async def update_address(
         address_update=address_update
     )
     if db_address is None:
-        logger.warning(f"Address with ID {address_id} not found")
+        logger.warning("Address with ID %s not found", address_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Address with ID {address_id} not found"
         )
+    await invalidate_cache()
     return db_address
 
 
@@ -102,50 +323,10 @@ async def delete_address(
 ):
     success = crud.delete_address(db=db, address_id=address_id)
     if not success:
-        logger.warning(f"Address with ID {address_id} not found")
+        logger.warning("Address with ID %s not found", address_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Address with ID {address_id} not found"
         )
+    await invalidate_cache()
     return None
-
-
-@router.post(
-    "/addresses/nearby",
-    response_model=List[AddressWithDistance]
-)
-async def get_nearby_addresses(
-        location: LocationQuery,
-        db: Session = Depends(get_db)
-):
-    try:
-        addresses = crud.get_addresses_within_radius(
-            db=db,
-            latitude=location.latitude,
-            longitude=location.longitude,
-            radius_km=location.radius_km
-        )
-
-        addresses_with_distance = []
-        for address in addresses:
-            distance = crud.calculate_distance(
-                location.latitude,
-                location.longitude,
-                address.latitude,
-                address.longitude
-            )
-            address_dict = {
-                **address.__dict__,
-                "distance_km": round(distance, 2)
-            }
-            addresses_with_distance.append(address_dict)
-
-        addresses_with_distance.sort(key=lambda x: x["distance_km"])
-
-        return addresses_with_distance
-    except Exception as e:
-        logger.error(f"Error finding nearby addresses: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to find nearby addresses"
-        )
\ No newline at end of file
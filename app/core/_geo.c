@@ -0,0 +1,45 @@
+/*
+ * Native geometry kernels, loaded by app/core/geo.py through ctypes.
+ *
+ * Build with:
+ *     gcc -O3 -fno-math-errno -fopenmp-simd -shared -fPIC -o app/core/_geo.so app/core/_geo.c -lm
+ *
+ * Don't build with -ffast-math: gcc then links crtfastmath.o into the library,
+ * which turns on flush-to-zero for the whole process that loads it.
+ */
+#include <math.h>
+#include <stddef.h>
+
+#define DEG_TO_RAD 0.017453292519943295
+
+/*
+ * Convert n latitude/longitude pairs in degrees to unit-sphere vectors.
+ */
+void unit_vectors(const double *lats, const double *lons,
+                  double *xs, double *ys, double *zs, size_t n)
+{
+    #pragma omp simd
+    for (size_t i = 0; i < n; i++) {
+        double lat = lats[i] * DEG_TO_RAD;
+        double lon = lons[i] * DEG_TO_RAD;
+        double cos_lat = cos(lat);
+
+        xs[i] = cos_lat * cos(lon);
+        ys[i] = cos_lat * sin(lon);
+        zs[i] = sin(lat);
+    }
+}
+
+/*
+ * Dot products of n unit vectors with a reference unit vector, i.e. the
+ * cosines of their central angles to the reference point.
+ */
+void dot_products(double x0, double y0, double z0,
+                  const double *xs, const double *ys, const double *zs,
+                  double *out, size_t n)
+{
+    #pragma omp simd
+    for (size_t i = 0; i < n; i++) {
+        out[i] = x0 * xs[i] + y0 * ys[i] + z0 * zs[i];
+    }
+}
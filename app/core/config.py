@@ -13,6 +13,15 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./address_book.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    # Log every SQL statement, independently of DEBUG
+    SQL_ECHO: bool = False
+
+    # Cache (requires Redis, see REDIS_URL)
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_ENABLED: bool = False
+    CACHE_PREFIX: str = "addrbook"
 
     # Geolocation
     EARTH_RADIUS_KM: float = 6371.0
@@ -0,0 +1,132 @@
+import ctypes
+import logging
+import math
+from pathlib import Path
+from typing import Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Coordinates are also stored as integers in units of 1e-7 degrees (about
+# 1 cm), which keeps every valid longitude within int32 range.
+E7_SCALE = 10_000_000
+
+# Optional native kernels built from _geo.c (see the Dockerfile). The NumPy
+# implementations below are used when the shared library isn't available.
+_LIB_PATH = Path(__file__).with_name("_geo.so")
+_DOUBLE_ARRAY = np.ctypeslib.ndpointer(dtype=np.float64, flags="C_CONTIGUOUS")
+
+try:
+    _lib = ctypes.CDLL(str(_LIB_PATH))
+except OSError:
+    _lib = None
+    logger.info("Native geometry kernels not built, using NumPy")
+else:
+    _lib.unit_vectors.argtypes = [
+        _DOUBLE_ARRAY, _DOUBLE_ARRAY,
+        _DOUBLE_ARRAY, _DOUBLE_ARRAY, _DOUBLE_ARRAY,
+        ctypes.c_size_t,
+    ]
+    _lib.unit_vectors.restype = None
+    _lib.dot_products.argtypes = [
+        ctypes.c_double, ctypes.c_double, ctypes.c_double,
+        _DOUBLE_ARRAY, _DOUBLE_ARRAY, _DOUBLE_ARRAY,
+        _DOUBLE_ARRAY,
+        ctypes.c_size_t,
+    ]
+    _lib.dot_products.restype = None
+
+
+def to_e7(degrees: float) -> int:
+    """
+    Convert a coordinate in degrees to fixed-point units of 1e-7 degrees.
+
+    Args:
+        degrees: Latitude or longitude in degrees
+
+    Returns:
+        Coordinate as an integer
+    """
+    return round(degrees * E7_SCALE)
+
+
+def unit_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """
+    Convert a coordinate to a point on the unit sphere.
+
+    The dot product of two such vectors is the cosine of the angle between
+    them, so distances can be computed without any trigonometry per point.
+
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+
+    Returns:
+        Tuple of (x, y, z)
+    """
+    lat_rad = math.radians(latitude)
+    lon_rad = math.radians(longitude)
+    cos_lat = math.cos(lat_rad)
+    return cos_lat * math.cos(lon_rad), cos_lat * math.sin(lon_rad), math.sin(lat_rad)
+
+
+def unit_vectors(
+        latitudes: Sequence[float],
+        longitudes: Sequence[float]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert many coordinates to points on the unit sphere at once.
+    Batch counterpart of unit_vector.
+
+    Args:
+        latitudes: Latitudes in degrees
+        longitudes: Longitudes in degrees
+
+    Returns:
+        Tuple of (xs, ys, zs) float64 arrays
+    """
+    lats = np.ascontiguousarray(latitudes, dtype=np.float64)
+    lons = np.ascontiguousarray(longitudes, dtype=np.float64)
+
+    if _lib is not None:
+        xs = np.empty_like(lats)
+        ys = np.empty_like(lats)
+        zs = np.empty_like(lats)
+        _lib.unit_vectors(lats, lons, xs, ys, zs, lats.size)
+        return xs, ys, zs
+
+    lat_rad = np.radians(lats)
+    lon_rad = np.radians(lons)
+    cos_lat = np.cos(lat_rad)
+    return cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad)
+
+
+def dot_products(
+        origin: Tuple[float, float, float],
+        xs: np.ndarray,
+        ys: np.ndarray,
+        zs: np.ndarray
+) -> np.ndarray:
+    """
+    Dot products of many unit vectors with a reference unit vector, i.e. the
+    cosines of their central angles to the reference point.
+
+    Args:
+        origin: Unit vector of the reference point
+        xs, ys, zs: Unit vectors of the other points
+
+    Returns:
+        float64 array of dot products
+    """
+    xs = np.ascontiguousarray(xs, dtype=np.float64)
+    ys = np.ascontiguousarray(ys, dtype=np.float64)
+    zs = np.ascontiguousarray(zs, dtype=np.float64)
+    x0, y0, z0 = origin
+
+    if _lib is not None:
+        out = np.empty_like(xs)
+        _lib.dot_products(x0, y0, z0, xs, ys, zs, out, xs.size)
+        return out
+
+    return xs * x0 + ys * y0 + zs * z0
@@ -1,18 +1,32 @@
 import logging
-from typing import List, Optional
+from math import acos, asin, ceil, cos, degrees, floor, pi, radians, sin
+from typing import List, Optional, Sequence, Tuple
 
+import numpy as np
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.geo import E7_SCALE, dot_products, to_e7, unit_vector, unit_vectors
+from app.db.address_table import address_table
 from app.models.address import AddressCreate, AddressUpdate
-from app.schemas.address import Address
+from app.schemas.address import Address, addresses_rtree
 
 logger = logging.getLogger(__name__)
 
+# Stay well below SQLite's limit on bound parameters per statement
+ID_CHUNK_SIZE = 500
+
+EARTH_RADIUS_KM = settings.EARTH_RADIUS_KM
+
 
 def create_address(db: Session, address: AddressCreate) -> Address:
     """
     Create a new address in the database.
 
+    The row is written with a single INSERT ... RETURNING, so the created
+    object doesn't need to be refreshed afterwards.
+
     Args:
         db: Database session
         address: Address data to create
@@ -20,17 +34,74 @@ def create_address(db: Session, address: AddressCreate) -> Address:
     Returns:
         Created Address object
     """
-    logger.info(f"Creating new address in {address.city}, {address.country}")
-
-    db_address = Address(**address.model_dump())
-    db.add(db_address)
+    logger.info("Creating new address in %s, %s", address.city, address.country)
+
+    x, y, z = unit_vector(address.latitude, address.longitude)
+    db_address = db.scalars(
+        insert(Address)
+        .values(
+            street=address.street,
+            city=address.city,
+            state=address.state,
+            country=address.country,
+            postal_code=address.postal_code,
+            latitude=address.latitude,
+            longitude=address.longitude,
+            lat_e7=to_e7(address.latitude),
+            lon_e7=to_e7(address.longitude),
+            x=x,
+            y=y,
+            z=z
+        )
+        .returning(Address)
+    ).one()
     db.commit()
-    db.refresh(db_address)
 
-    logger.info(f"Address created successfully with ID: {db_address.id}")
+    logger.info("Address created successfully with ID: %s", db_address.id)
     return db_address
 
 
+def create_addresses_bulk(db: Session, addresses: List[AddressCreate]) -> List[int]:
+    """
+    Create many addresses in a single executemany round-trip and commit.
+
+    Args:
+        db: Database session
+        addresses: Address data to create
+
+    Returns:
+        IDs of the created addresses, in the order they were given
+    """
+    logger.info("Creating %s addresses in bulk", len(addresses))
+    if not addresses:
+        return []
+
+    xs, ys, zs = unit_vectors(
+        [address.latitude for address in addresses],
+        [address.longitude for address in addresses]
+    )
+    rows = [
+        {
+            **address.model_dump(),
+            "lat_e7": to_e7(address.latitude),
+            "lon_e7": to_e7(address.longitude),
+            "x": x,
+            "y": y,
+            "z": z
+        }
+        for address, x, y, z in zip(addresses, xs.tolist(), ys.tolist(), zs.tolist())
+    ]
+
+    address_ids = db.scalars(
+        insert(Address).returning(Address.id, sort_by_parameter_order=True),
+        rows
+    ).all()
+    db.commit()
+
+    logger.info("%s addresses created successfully", len(rows))
+    return address_ids
+
+
 def get_address(db: Session, address_id: int) -> Optional[Address]:
     """
     Retrieve a single address by ID.
@@ -42,7 +113,6 @@ def get_address(db: Session, address_id: int) -> Optional[Address]:
     Returns:
         Address object if found, None otherwise
     """
-    logger.debug(f"Fetching address with ID: {address_id}")
     return db.query(Address).filter(Address.id == address_id).first()
 
 
@@ -58,7 +128,7 @@ def get_addresses(db: Session, skip: int = 0, limit: int = 100) -> List[Address]
     Returns:
         List of Address objects
     """
-    logger.debug(f"Fetching addresses with skip={skip}, limit={limit}")
+    logger.debug("Fetching addresses with skip=%s, limit=%s", skip, limit)
     return db.query(Address).offset(skip).limit(limit).all()
 
 
@@ -78,21 +148,28 @@ def update_address(
     Returns:
         Updated Address object if found, None otherwise
     """
-    logger.info(f"Updating address with ID: {address_id}")
+    logger.info("Updating address with ID: %s", address_id)
 
     db_address = get_address(db, address_id)
     if not db_address:
-        logger.warning(f"Address with ID {address_id} not found")
+        logger.warning("Address with ID %s not found", address_id)
         return None
 
     update_data = address_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_address, field, value)
 
+    if "latitude" in update_data or "longitude" in update_data:
+        db_address.lat_e7 = to_e7(db_address.latitude)
+        db_address.lon_e7 = to_e7(db_address.longitude)
+        db_address.x, db_address.y, db_address.z = unit_vector(
+            db_address.latitude, db_address.longitude
+        )
+
     db.commit()
     db.refresh(db_address)
 
-    logger.info(f"Address {address_id} updated successfully")
+    logger.info("Address %s updated successfully", address_id)
     return db_address
 
 
@@ -107,17 +184,17 @@ def delete_address(db: Session, address_id: int) -> bool:
     Returns:
         True if address was deleted, False if not found
     """
-    logger.info(f"Deleting address with ID: {address_id}")
+    logger.info("Deleting address with ID: %s", address_id)
 
     db_address = get_address(db, address_id)
     if not db_address:
-        logger.warning(f"Address with ID {address_id} not found")
+        logger.warning("Address with ID %s not found", address_id)
         return False
 
     db.delete(db_address)
     db.commit()
 
-    logger.info(f"Address {address_id} deleted successfully")
+    logger.info("Address %s deleted successfully", address_id)
     return True
 
 
@@ -125,69 +202,195 @@ def get_addresses_within_radius(
         db: Session,
         latitude: float,
         longitude: float,
-        radius_km: float
-) -> List[Address]:
+        radius_km: float,
+        limit: Optional[int] = None
+) -> List[Tuple[Address, float]]:
     """
     Retrieve all addresses within a given radius from a location.
-    Uses the Haversine formula for distance calculation.
+
+    Candidates are narrowed down to the bounding box of the search circle,
+    compared against the fixed-point coordinates, and the dot product of
+    the stored unit vectors rejects the rest. Results are ordered by that
+    dot product, which grows as distance shrinks, so acos() only has to be
+    taken for the addresses actually returned.
+
+    The search runs on the in-memory address table once it is loaded, after
+    catching it up with changes made by any worker, so only the matching
+    rows are fetched from the database. Otherwise it runs as one SQL
+    statement using the R-Tree index.
 
     Args:
         db: Database session
         latitude: Reference latitude
         longitude: Reference longitude
         radius_km: Search radius in kilometers
+        limit: Maximum number of closest addresses to return (all if None)
 
     Returns:
-        List of Address objects within the radius
+        List of (Address, distance in kilometers) tuples, closest first
     """
     logger.info(
-        f"Searching addresses within {radius_km}km of "
-        f"coordinates ({latitude}, {longitude})"
+        "Searching addresses within %skm of coordinates (%s, %s)",
+        radius_km, latitude, longitude
     )
 
-    all_addresses = db.query(Address).all()
+    bounding_box = _bounding_box(latitude, longitude, radius_km)
 
-    nearby_addresses = []
-    for address in all_addresses:
-        distance = calculate_distance(
-            latitude, longitude,
-            address.latitude, address.longitude
-        )
-        if distance <= radius_km:
-            nearby_addresses.append(address)
+    # Points within the radius are those whose angle to the reference point
+    # is at most radius / R, i.e. whose dot product is at least its cosine.
+    origin = unit_vector(latitude, longitude)
+    min_dot = cos(min(radius_km / EARTH_RADIUS_KM, pi))
+
+    if address_table.loaded:
+        address_table.sync(db)
+        ids, dots = address_table.search(bounding_box, origin, min_dot, limit)
+        rows = _get_addresses_by_ids(db, ids.tolist(), dots.tolist())
+    else:
+        rows = _query_within_radius(db, bounding_box, origin, min_dot, limit)
 
-    logger.info(f"Found {len(nearby_addresses)} addresses within radius")
+    nearby_addresses = [
+        (address, EARTH_RADIUS_KM * acos(min(1.0, arg)))
+        for address, arg in rows
+    ]
+
+    logger.info("Found %s addresses within radius", len(nearby_addresses))
     return nearby_addresses
 
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+def rank_within_radius(
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: Optional[int] = None
+) -> List[Tuple[int, float]]:
     """
-    Calculate the great circle distance between two points on Earth.
-    Uses the Haversine formula.
+    Rank points already in memory by distance from a location, keeping
+    those within the radius. Used to narrow a cached candidate set down to
+    one request.
 
     Args:
-        lat1: Latitude of first point
-        lon1: Longitude of first point
-        lat2: Latitude of second point
-        lon2: Longitude of second point
+        latitudes: Latitudes of the points
+        longitudes: Longitudes of the points
+        latitude: Reference latitude
+        longitude: Reference longitude
+        radius_km: Search radius in kilometers
+        limit: Maximum number of closest points to return (all if None)
 
     Returns:
-        Distance in kilometers
+        List of (index of the point, distance in kilometers) tuples,
+        closest first
     """
-    from math import radians, sin, cos, sqrt, atan2
-    from app.core.config import settings
+    xs, ys, zs = unit_vectors(latitudes, longitudes)
+    dots = dot_products(unit_vector(latitude, longitude), xs, ys, zs)
+    min_dot = cos(min(radius_km / EARTH_RADIUS_KM, pi))
+
+    within = np.flatnonzero(dots >= min_dot)
+    order = within[np.argsort(-dots[within], kind="stable")][:limit]
+    return [
+        (index, EARTH_RADIUS_KM * acos(min(1.0, dot)))
+        for index, dot in zip(order.tolist(), dots[order].tolist())
+    ]
+
+
+def _get_addresses_by_ids(
+        db: Session,
+        address_ids: List[int],
+        dots: List[float]
+) -> List[Tuple[Address, float]]:
+    """
+    Load addresses by ID, keeping the order of `address_ids` and pairing
+    each with its dot product.
+    """
+    by_id = {}
+    for start in range(0, len(address_ids), ID_CHUNK_SIZE):
+        chunk = address_ids[start:start + ID_CHUNK_SIZE]
+        for address in db.query(Address).filter(Address.id.in_(chunk)):
+            by_id[address.id] = address
+
+    return [
+        (by_id[address_id], dot)
+        for address_id, dot in zip(address_ids, dots)
+        if address_id in by_id
+    ]
+
+
+def _query_within_radius(
+        db: Session,
+        bounding_box: Tuple[int, int, Optional[int], Optional[int]],
+        origin: Tuple[float, float, float],
+        min_dot: float,
+        limit: Optional[int]
+) -> List[Tuple[Address, float]]:
+    """
+    Run the radius search in SQL, returning (Address, dot product) rows
+    ordered by decreasing dot product.
+    """
+    lat_min, lat_max, lon_min, lon_max = bounding_box
+    if lon_min is None:
+        lon_min, lon_max = to_e7(-180.0), to_e7(180.0)
+
+    x0, y0, z0 = origin
+    dot = Address.x * x0 + Address.y * y0 + Address.z * z0
+
+    return (
+        db.query(Address, dot)
+        .join(addresses_rtree, addresses_rtree.c.id == Address.id)
+        .filter(
+            addresses_rtree.c.maxLat >= lat_min,
+            addresses_rtree.c.minLat <= lat_max,
+            addresses_rtree.c.maxLon >= lon_min,
+            addresses_rtree.c.minLon <= lon_max,
+            dot >= min_dot
+        )
+        .order_by(dot.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def _bounding_box(
+        latitude: float,
+        longitude: float,
+        radius_km: float
+) -> Tuple[int, int, Optional[int], Optional[int]]:
+    """
+    Compute the latitude/longitude box enclosing a search circle, in
+    fixed-point units of 1e-7 degrees. The bounds are rounded outwards so
+    the box never excludes a point inside the circle.
+
+    Args:
+        latitude: Reference latitude
+        longitude: Reference longitude
+        radius_km: Search radius in kilometers
+
+    Returns:
+        Tuple of (lat_min, lat_max, lon_min, lon_max). The longitude bounds
+        are None when the circle covers a pole or crosses the antimeridian,
+        in which case no longitude filter can be applied.
+    """
+    angular_radius = radius_km / EARTH_RADIUS_KM
+    lat_delta = degrees(angular_radius)
+    lat_min = latitude - lat_delta
+    lat_max = latitude + lat_delta
+
+    if lat_min <= -90 or lat_max >= 90:
+        return _floor_e7(max(lat_min, -90.0)), _ceil_e7(min(lat_max, 90.0)), None, None
+
+    lon_delta = degrees(asin(min(sin(angular_radius) / cos(radians(latitude)), 1.0)))
+    lon_min = longitude - lon_delta
+    lon_max = longitude + lon_delta
+
+    if lon_min < -180 or lon_max > 180:
+        return _floor_e7(lat_min), _ceil_e7(lat_max), None, None
 
-    lat1_rad = radians(lat1)
-    lon1_rad = radians(lon1)
-    lat2_rad = radians(lat2)
-    lon2_rad = radians(lon2)
+    return _floor_e7(lat_min), _ceil_e7(lat_max), _floor_e7(lon_min), _ceil_e7(lon_max)
 
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
 
-    a = sin(dlat / 2) ** 2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+def _floor_e7(degrees: float) -> int:
+    return floor(degrees * E7_SCALE)
 
-    distance = settings.EARTH_RADIUS_KM * c
 
-    return distance
\ No newline at end of file
+def _ceil_e7(degrees: float) -> int:
+    return ceil(degrees * E7_SCALE)
\ No newline at end of file
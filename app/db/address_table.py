@@ -0,0 +1,169 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.geo import dot_products
+from app.schemas.address import Address, address_changes
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("ids", "lat_e7", "lon_e7", "x", "y", "z")
+DTYPES = (np.int64, np.int32, np.int32, np.float64, np.float64, np.float64)
+COORDINATE_COLUMNS = (Address.id, Address.lat_e7, Address.lon_e7, Address.x, Address.y, Address.z)
+
+
+def _empty(dtype) -> np.ndarray:
+    return np.empty(0, dtype=dtype)
+
+
+@dataclass
+class AddressTable:
+    """
+    Columnar in-memory copy of address coordinates, sorted by id.
+
+    Radius searches run on these contiguous arrays instead of querying and
+    materializing rows. Coordinates are kept as int32 fixed-point values
+    (see app.core.geo.to_e7), which halves the memory the bounding-box
+    filter has to scan.
+
+    The table is kept current by replaying the address change log (see
+    sync()), so writes made by any worker process show up. Changes replace
+    the arrays rather than writing to them, so a search always works on a
+    consistent snapshot.
+    """
+
+    ids: np.ndarray = field(default_factory=lambda: _empty(np.int64))
+    lat_e7: np.ndarray = field(default_factory=lambda: _empty(np.int32))
+    lon_e7: np.ndarray = field(default_factory=lambda: _empty(np.int32))
+    x: np.ndarray = field(default_factory=lambda: _empty(np.float64))
+    y: np.ndarray = field(default_factory=lambda: _empty(np.float64))
+    z: np.ndarray = field(default_factory=lambda: _empty(np.float64))
+    loaded: bool = False
+    # Sequence number of the last address change applied
+    last_change: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def load(self, db: Session) -> None:
+        """
+        (Re)load all address coordinates from the database.
+
+        Args:
+            db: Database session
+        """
+        # Read the log position first, so changes committed while the rows
+        # are being read are replayed by the next sync()
+        last_change = db.scalar(select(func.coalesce(func.max(address_changes.c.seq), 0)))
+        rows = db.execute(
+            select(*COORDINATE_COLUMNS).order_by(Address.id)
+        ).all()
+        columns = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+
+        with self._lock:
+            for name, dtype, values in zip(COLUMNS, DTYPES, columns):
+                setattr(self, name, np.array(values, dtype=dtype))
+            self.last_change = last_change
+            self.loaded = True
+
+        logger.info("Loaded %s addresses into the in-memory table", len(rows))
+
+    def sync(self, db: Session) -> None:
+        """
+        Apply the address changes logged since the table was last loaded or
+        synced, including those made by other worker processes.
+
+        Args:
+            db: Database session
+        """
+        if not self.loaded:
+            return
+
+        first_change, last_change = db.execute(
+            select(func.min(address_changes.c.seq), func.max(address_changes.c.seq))
+        ).one()
+        if last_change is None or last_change <= self.last_change:
+            return
+        if first_change > self.last_change + 1:
+            # Changes we haven't seen have been pruned from the log
+            self.load(db)
+            return
+
+        changed_ids = (
+            select(address_changes.c.address_id)
+            .where(
+                address_changes.c.seq > self.last_change,
+                address_changes.c.seq <= last_change
+            )
+            .distinct()
+        )
+        address_ids = db.scalars(changed_ids).all()
+        rows = db.execute(
+            select(*COORDINATE_COLUMNS)
+            .where(Address.id.in_(changed_ids.scalar_subquery()))
+            .order_by(Address.id)
+        ).all()
+        columns = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+        values = [
+            np.array(column, dtype=dtype)
+            for column, dtype in zip(columns, DTYPES)
+        ]
+
+        with self._lock:
+            # Drop every changed address, then add back those still present
+            keep = ~np.isin(self.ids, np.array(address_ids, dtype=np.int64))
+            merged = [
+                np.concatenate((getattr(self, name)[keep], column))
+                for name, column in zip(COLUMNS, values)
+            ]
+            order = np.argsort(merged[0], kind="stable")
+            for name, column in zip(COLUMNS, merged):
+                setattr(self, name, column[order])
+            self.last_change = max(self.last_change, last_change)
+
+    def search(
+            self,
+            bounding_box: Tuple[int, int, Optional[int], Optional[int]],
+            origin: Tuple[float, float, float],
+            min_dot: float,
+            limit: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the addresses whose dot product with `origin` is at least
+        `min_dot`, closest first.
+
+        Args:
+            bounding_box: (lat_min, lat_max, lon_min, lon_max) prefilter in
+                fixed-point units. The longitude bounds may be None to skip
+                filtering on longitude.
+            origin: Unit vector of the reference point
+            min_dot: Smallest dot product to accept
+            limit: Maximum number of addresses to return (all if None)
+
+        Returns:
+            Tuple of (ids, dot products) arrays, ordered by decreasing dot
+            product
+        """
+        with self._lock:
+            ids, lat_e7, lon_e7, xs, ys, zs = (getattr(self, name) for name in COLUMNS)
+
+        lat_min, lat_max, lon_min, lon_max = bounding_box
+        mask = (lat_e7 >= lat_min) & (lat_e7 <= lat_max)
+        if lon_min is not None:
+            mask &= (lon_e7 >= lon_min) & (lon_e7 <= lon_max)
+        candidates = np.flatnonzero(mask)
+
+        dots = dot_products(origin, xs[candidates], ys[candidates], zs[candidates])
+        within = dots >= min_dot
+        candidates = candidates[within]
+        dots = dots[within]
+
+        order = np.argsort(-dots, kind="stable")[:limit]
+        return ids[candidates[order]], dots[order]
+
+
+# Shared table, loaded at application startup
+address_table = AddressTable()
@@ -1,36 +1,261 @@
 import logging
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import Connection, create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.core.geo import to_e7, unit_vectors
 
 logger = logging.getLogger(__name__)
 
+# Applied to every new connection. WAL lets readers proceed while a write
+# is in progress, and memory-mapped I/O avoids read() copies on scans.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False},
-    echo=settings.DEBUG
+    poolclass=QueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    echo=settings.SQL_ECHO
 )
 
-# session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+# session factory. Objects stay loaded after commit, so rows returned by an
+# INSERT ... RETURNING don't have to be fetched again.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # declarative models
 Base = declarative_base()
 
 
+# How long a worker waits for another one to finish setting up the schema
+SCHEMA_LOCK_TIMEOUT_MS = 60000
+
+
 def create_tables():
     try:
-        Base.metadata.create_all(bind=engine)
+        # Every worker process runs this at startup. Taking the write lock
+        # up front makes them set up the schema one at a time, and the later
+        # ones find it already in place.
+        with engine.connect() as conn:
+            busy_timeout = conn.exec_driver_sql("PRAGMA busy_timeout").scalar()
+            conn.exec_driver_sql(f"PRAGMA busy_timeout = {SCHEMA_LOCK_TIMEOUT_MS}")
+            try:
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                Base.metadata.create_all(bind=conn)
+                migrate_addresses_table(conn)
+                create_spatial_index(conn)
+                create_change_log(conn)
+                conn.commit()
+            finally:
+                conn.exec_driver_sql(f"PRAGMA busy_timeout = {busy_timeout}")
         logger.info("Database tables created successfully")
     except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
+        logger.error("Error creating database tables: %s", e)
         raise
 
 
+# Columns derived from latitude/longitude that were added to the addresses
+# table after its first release. create_all() doesn't add columns to an
+# existing table, so migrate_addresses_table() does.
+DERIVED_COLUMNS = {
+    "x": "FLOAT",
+    "y": "FLOAT",
+    "z": "FLOAT",
+    "lat_e7": "INTEGER",
+    "lon_e7": "INTEGER",
+}
+
+
+# B-tree indexes of earlier schemas that no query uses any more. Bounding-box
+# filtering goes through the R-Tree or the in-memory address table.
+OBSOLETE_INDEXES = (
+    "ix_addresses_latitude",
+    "ix_addresses_longitude",
+    "ix_addresses_lat_e7",
+    "ix_addresses_lon_e7",
+)
+
+
+def migrate_addresses_table(conn: Connection):
+    """
+    Bring an existing addresses table up to date: drop indexes no longer
+    used, and add the missing derived coordinate columns, backfilled from
+    latitude/longitude.
+
+    Args:
+        conn: Connection to run the statements on, inside its transaction
+    """
+    for index in OBSOLETE_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+
+    existing = {column["name"] for column in inspect(conn).get_columns("addresses")}
+    missing = [name for name in DERIVED_COLUMNS if name not in existing]
+    if not missing:
+        return
+
+    logger.info("Adding columns %s to the addresses table", ", ".join(missing))
+
+    if "lat_e7" in missing:
+        # The R-Tree and its triggers predate the fixed-point columns and
+        # index the float coordinates; create_spatial_index() rebuilds them.
+        conn.execute(text("DROP TRIGGER IF EXISTS addresses_rtree_insert"))
+        conn.execute(text("DROP TRIGGER IF EXISTS addresses_rtree_update"))
+        conn.execute(text("DROP TRIGGER IF EXISTS addresses_rtree_delete"))
+        conn.execute(text("DROP TABLE IF EXISTS addresses_rtree"))
+
+    for name in missing:
+        conn.execute(text(
+            f"ALTER TABLE addresses ADD COLUMN {name} {DERIVED_COLUMNS[name]} NOT NULL DEFAULT 0"
+        ))
+
+    rows = conn.execute(text("SELECT id, latitude, longitude FROM addresses")).all()
+    if rows:
+        ids, latitudes, longitudes = zip(*rows)
+        xs, ys, zs = unit_vectors(latitudes, longitudes)
+        conn.execute(
+            text(
+                "UPDATE addresses SET x = :x, y = :y, z = :z, "
+                "lat_e7 = :lat_e7, lon_e7 = :lon_e7 WHERE id = :id"
+            ),
+            [
+                {
+                    "id": address_id,
+                    "x": x,
+                    "y": y,
+                    "z": z,
+                    "lat_e7": to_e7(latitude),
+                    "lon_e7": to_e7(longitude)
+                }
+                for address_id, latitude, longitude, x, y, z in zip(
+                    ids, latitudes, longitudes, xs.tolist(), ys.tolist(), zs.tolist()
+                )
+            ]
+        )
+
+    logger.info("Backfilled derived coordinates of %s addresses", len(rows))
+
+
+# Keep the R-Tree in sync inside SQLite, so every write path (ORM, Core
+# and bulk inserts alike) maintains it.
+SPATIAL_INDEX_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS addresses_rtree_insert AFTER INSERT ON addresses
+    BEGIN
+        INSERT OR REPLACE INTO addresses_rtree (id, minLat, maxLat, minLon, maxLon)
+        VALUES (NEW.id, NEW.lat_e7, NEW.lat_e7, NEW.lon_e7, NEW.lon_e7);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS addresses_rtree_update AFTER UPDATE OF lat_e7, lon_e7 ON addresses
+    BEGIN
+        INSERT OR REPLACE INTO addresses_rtree (id, minLat, maxLat, minLon, maxLon)
+        VALUES (NEW.id, NEW.lat_e7, NEW.lat_e7, NEW.lon_e7, NEW.lon_e7);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS addresses_rtree_delete AFTER DELETE ON addresses
+    BEGIN
+        DELETE FROM addresses_rtree WHERE id = OLD.id;
+    END
+    """,
+)
+
+
+def create_spatial_index(conn: Connection):
+    """
+    Create the R-Tree index used by radius searches along with the triggers
+    maintaining it, and backfill it from existing addresses when it is
+    created for the first time.
+
+    Args:
+        conn: Connection to run the statements on, inside its transaction
+    """
+    if not inspect(conn).has_table("addresses_rtree"):
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS addresses_rtree "
+            "USING rtree_i32(id, minLat, maxLat, minLon, maxLon)"
+        ))
+        conn.execute(text(
+            "INSERT OR REPLACE INTO addresses_rtree (id, minLat, maxLat, minLon, maxLon) "
+            "SELECT id, lat_e7, lat_e7, lon_e7, lon_e7 FROM addresses"
+        ))
+        logger.info("Spatial index created successfully")
+
+    for trigger in SPATIAL_INDEX_TRIGGERS:
+        conn.execute(text(trigger))
+
+
+# Only the most recent changes are kept; a worker that falls further behind
+# reloads its in-memory table from scratch.
+CHANGE_LOG_SIZE = 10000
+
+CHANGE_LOG_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS address_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        address_id INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS address_changes_insert AFTER INSERT ON addresses
+    BEGIN
+        INSERT INTO address_changes (address_id) VALUES (NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS address_changes_update AFTER UPDATE OF lat_e7, lon_e7 ON addresses
+    BEGIN
+        INSERT INTO address_changes (address_id) VALUES (NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS address_changes_delete AFTER DELETE ON addresses
+    BEGIN
+        INSERT INTO address_changes (address_id) VALUES (OLD.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS address_changes_prune AFTER INSERT ON address_changes
+    BEGIN
+        DELETE FROM address_changes WHERE seq <= NEW.seq - {CHANGE_LOG_SIZE};
+    END
+    """,
+)
+
+
+def create_change_log(conn: Connection):
+    """
+    Create the log of address coordinate changes and the triggers appending
+    to it, which keep the in-memory address table of every worker process
+    up to date.
+
+    Args:
+        conn: Connection to run the statements on, inside its transaction
+    """
+    for statement in CHANGE_LOG_STATEMENTS:
+        conn.execute(text(statement))
+
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
@@ -1,12 +1,18 @@
 import logging
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
 
 from app.api.routes import addresses
 from app.core.config import settings
-from app.db.database import create_tables
+from app.db.address_table import address_table
+from app.db.database import SessionLocal, create_tables
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,10 +33,22 @@ async def lifespan(app: FastAPI):
     create_tables()
     logger.info("Database tables created successfully")
 
+    # Keep address coordinates in memory for radius searches
+    with SessionLocal() as db:
+        address_table.load(db)
+
+    redis = aioredis.from_url(settings.REDIS_URL)
+    FastAPICache.init(
+        RedisBackend(redis),
+        prefix=settings.CACHE_PREFIX,
+        enable=settings.CACHE_ENABLED
+    )
+
     yield
 
     # Shutdown: Cleanup operations
     logger.info("Shutting down Address Book API...")
+    await redis.close()
 
 
 # Initialize FastAPI application
@@ -38,6 +56,7 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.DESCRIPTION,
     version=settings.VERSION,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -72,10 +91,15 @@ async def health_check():
 if __name__ == "__main__":
     import uvicorn
 
-    logger.info(f"Starting server on {settings.HOST}:{settings.PORT}")
+    logger.info("Starting server on %s:%s", settings.HOST, settings.PORT)
+    # One worker process per CPU outside of debug mode. Each worker keeps
+    # its own in-memory address table, synced through the change log.
     uvicorn.run(
-        "main:app",
+        "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=None if settings.DEBUG else os.cpu_count(),
         reload=settings.DEBUG
     )
\ No newline at end of file
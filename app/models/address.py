@@ -63,11 +63,4 @@ class AddressResponse(AddressBase):
 
 class AddressWithDistance(AddressResponse):
 
-    distance_km: float = Field(..., description="Distance in kilometers from reference point")
-
-
-class LocationQuery(BaseModel):
-
-    latitude: float = Field(..., ge=-90, le=90, description="Reference latitude")
-    longitude: float = Field(..., ge=-180, le=180, description="Reference longitude")
-    radius_km: float = Field(..., gt=0, description="Search radius in kilometers")
\ No newline at end of file
+    distance_km: float = Field(..., description="Distance in kilometers from reference point")
\ No newline at end of file
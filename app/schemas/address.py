@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, MetaData, Table
 
 from app.db.database import Base
 
@@ -14,10 +14,44 @@ class Address(Base):
     state = Column(String(100), nullable=True)
     country = Column(String(100), nullable=False)
     postal_code = Column(String(20), nullable=True)
-    latitude = Column(Float, nullable=False, index=True)
-    longitude = Column(Float, nullable=False, index=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    # Fixed-point copies of latitude/longitude (see app.core.geo.to_e7), used
+    # for bounding-box filtering with integer comparisons. They are indexed
+    # by the R-Tree, not by B-trees.
+    lat_e7 = Column(Integer, nullable=False)
+    lon_e7 = Column(Integer, nullable=False)
+    # Unit-sphere position derived from latitude/longitude, used for distances
+    x = Column(Float, nullable=False)
+    y = Column(Float, nullable=False)
+    z = Column(Float, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     def __repr__(self):
-        return f"<Address(id={self.id}, city={self.city}, country={self.country})>"
\ No newline at end of file
+        return f"<Address(id={self.id}, city={self.city}, country={self.country})>"
+
+
+# Integer R-Tree spatial index over the fixed-point address coordinates. The
+# virtual table and the triggers keeping it in sync are created by
+# create_tables(), so it is kept out of Base.metadata.
+addresses_rtree = Table(
+    "addresses_rtree",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("minLat", Integer),
+    Column("maxLat", Integer),
+    Column("minLon", Integer),
+    Column("maxLon", Integer),
+)
+
+
+# Log of address ids whose coordinates changed, appended by triggers and
+# replayed by each worker's in-memory address table (see
+# app.db.address_table). Like the R-Tree, it is created by create_tables().
+address_changes = Table(
+    "address_changes",
+    MetaData(),
+    Column("seq", Integer, primary_key=True),
+    Column("address_id", Integer, nullable=False),
+)
\ No newline at end of file
@@ -0,0 +1,80 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before any app module creates the
+# engine from these settings, and keep the log file app.main writes to the
+# working directory out of the source tree.
+TEST_DIR = tempfile.mkdtemp()
+os.chdir(TEST_DIR)
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DIR}/address_book.db"
+os.environ["DEBUG"] = "False"
+os.environ["CACHE_ENABLED"] = "False"
+
+import pytest
+from fastapi.testclient import TestClient
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.core.geo import to_e7, unit_vector
+from app.db.address_table import address_table
+from app.db.database import SessionLocal, create_tables
+from app.main import app
+from app.schemas.address import Address, address_changes
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tables():
+    create_tables()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    session.execute(delete(Address))
+    session.execute(delete(address_changes))
+    session.commit()
+    address_table.loaded = False
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    # FastAPICache.init() only takes effect once per process
+    FastAPICache.reset()
+    with TestClient(app) as client:
+        yield client
+    FastAPICache.reset()
+
+
+@pytest.fixture
+def cached_client(client):
+    """Client of an app caching responses in memory instead of Redis"""
+    InMemoryBackend._store.clear()
+    FastAPICache.reset()
+    FastAPICache.init(InMemoryBackend(), prefix=settings.CACHE_PREFIX, enable=True)
+    yield client
+
+
+def cache_keys():
+    return sorted(InMemoryBackend._store)
+
+
+def make_address(latitude: float, longitude: float) -> Address:
+    x, y, z = unit_vector(latitude, longitude)
+    return Address(
+        street="1 Main St",
+        city="City",
+        country="Country",
+        latitude=latitude,
+        longitude=longitude,
+        lat_e7=to_e7(latitude),
+        lon_e7=to_e7(longitude),
+        x=x,
+        y=y,
+        z=z
+    )
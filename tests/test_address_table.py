@@ -0,0 +1,84 @@
+import numpy as np
+from sqlalchemy import delete, func, select
+
+from app.db.address_table import COLUMNS, AddressTable
+from app.schemas.address import Address, address_changes
+from tests.conftest import make_address
+
+
+def assert_same(table: AddressTable, other: AddressTable):
+    for name in COLUMNS:
+        np.testing.assert_array_equal(getattr(table, name), getattr(other, name))
+
+
+def fresh(db) -> AddressTable:
+    table = AddressTable()
+    table.load(db)
+    return table
+
+
+def test_sync_applies_changes_made_after_load(db):
+    db.add_all([make_address(lat, 10.0) for lat in (1.0, 2.0, 3.0)])
+    db.commit()
+    table = fresh(db)
+    first, second, third = db.scalars(select(Address).order_by(Address.id)).all()
+
+    # Writes as another worker would make them
+    db.add(make_address(4.0, 10.0))
+    moved = make_address(-5.0, -20.0)
+    first.latitude, first.lat_e7, first.x, first.y, first.z = (
+        moved.latitude, moved.lat_e7, moved.x, moved.y, moved.z
+    )
+    second.city = "Renamed"
+    db.delete(third)
+    db.commit()
+
+    table.sync(db)
+
+    assert_same(table, fresh(db))
+    assert third.id not in table.ids
+    assert table.lat_e7[table.ids == first.id][0] == moved.lat_e7
+
+
+def test_sync_without_changes_keeps_the_arrays(db):
+    db.add(make_address(1.0, 1.0))
+    db.commit()
+    table = fresh(db)
+    ids = table.ids
+
+    table.sync(db)
+
+    assert table.ids is ids
+
+
+def test_sync_reloads_when_the_log_was_pruned_past_it(db, monkeypatch):
+    db.add(make_address(1.0, 1.0))
+    db.commit()
+    table = fresh(db)
+
+    db.add_all([make_address(2.0, 2.0), make_address(3.0, 3.0)])
+    db.commit()
+    # Drop the oldest unseen entry, as pruning a full log would
+    oldest = db.scalar(
+        select(func.min(address_changes.c.seq))
+        .where(address_changes.c.seq > table.last_change)
+    )
+    db.execute(delete(address_changes).where(address_changes.c.seq <= oldest))
+    db.commit()
+
+    loads = []
+    load = table.load
+    monkeypatch.setattr(table, "load", lambda session: loads.append(session) or load(session))
+    table.sync(db)
+
+    assert len(loads) == 1
+    assert_same(table, fresh(db))
+
+
+def test_sync_is_a_no_op_before_load(db):
+    table = AddressTable()
+
+    table.sync(db)
+
+    assert not table.loaded
+    assert table.ids.size == 0
@@ -0,0 +1,80 @@
+import math
+import random
+
+import pytest
+
+from app.core.geo import to_e7
+from app.crud.address import EARTH_RADIUS_KM, _bounding_box
+
+
+def destination(latitude: float, longitude: float, distance_km: float, bearing: float):
+    """Point reached by travelling distance_km from a start point along bearing."""
+    lat1 = math.radians(latitude)
+    lon1 = math.radians(longitude)
+    delta = distance_km / EARTH_RADIUS_KM
+    lat2 = math.asin(
+        math.sin(lat1) * math.cos(delta) + math.cos(lat1) * math.sin(delta) * math.cos(bearing)
+    )
+    lon2 = lon1 + math.atan2(
+        math.sin(bearing) * math.sin(delta) * math.cos(lat1),
+        math.cos(delta) - math.sin(lat1) * math.sin(lat2)
+    )
+    lon2 = (math.degrees(lon2) + 540) % 360 - 180
+    return math.degrees(lat2), lon2
+
+
+def in_box(box, latitude: float, longitude: float) -> bool:
+    lat_min, lat_max, lon_min, lon_max = box
+    if not lat_min <= to_e7(latitude) <= lat_max:
+        return False
+    return lon_min is None or lon_min <= to_e7(longitude) <= lon_max
+
+
+@pytest.mark.parametrize("latitude", [89.9, -89.9])
+def test_circle_covering_a_pole_has_no_longitude_bounds(latitude):
+    lat_min, lat_max, lon_min, lon_max = _bounding_box(latitude, 0, 500)
+
+    assert lon_min is None and lon_max is None
+    if latitude > 0:
+        assert lat_max == to_e7(90)
+    else:
+        assert lat_min == to_e7(-90)
+
+
+@pytest.mark.parametrize("longitude", [179.95, -179.95])
+def test_circle_crossing_the_antimeridian_has_no_longitude_bounds(longitude):
+    lat_min, lat_max, lon_min, lon_max = _bounding_box(0, longitude, 30)
+
+    assert lon_min is None and lon_max is None
+    assert lat_min < 0 < lat_max
+
+
+def test_circle_away_from_poles_and_antimeridian_is_bounded():
+    lat_min, lat_max, lon_min, lon_max = _bounding_box(48.85, 2.35, 20)
+
+    assert lat_min < to_e7(48.85) < lat_max
+    assert lon_min < to_e7(2.35) < lon_max
+
+
+@pytest.mark.parametrize(
+    "latitude, longitude, radius_km",
+    [
+        (0, 0, 100),
+        (48.85, 2.35, 20),
+        (-33.9, 151.2, 1),
+        (70, -179.5, 10),
+        (89, 45, 50),
+        (-88.5, -120, 300),
+        (10, 179.999, 0.05),
+        (60, 100, 5000),
+    ]
+)
+def test_box_contains_the_whole_circle(latitude, longitude, radius_km):
+    box = _bounding_box(latitude, longitude, radius_km)
+    rng = random.Random(0)
+
+    for _ in range(500):
+        # Points on and just inside the circle
+        distance = radius_km * rng.choice([1.0, 1.0 - 1e-9, rng.random()])
+        point = destination(latitude, longitude, distance, rng.uniform(0, 2 * math.pi))
+        assert in_box(box, *point), point
@@ -0,0 +1,66 @@
+import pytest
+
+from app.core.geo import to_e7, unit_vector
+from app.schemas.address import Address
+
+BULK_URL = "/api/v1/addresses/bulk"
+
+
+def address(city, latitude, longitude):
+    return {
+        "street": "1 Main St",
+        "city": city,
+        "country": "Country",
+        "latitude": latitude,
+        "longitude": longitude
+    }
+
+
+def test_bulk_create_returns_the_new_ids_in_request_order(client, db):
+    payload = [address("A", 1.0, 1.0), address("B", 2.0, 2.0), address("C", -3.0, 179.5)]
+
+    response = client.post(BULK_URL, json=payload)
+
+    assert response.status_code == 201
+    ids = response.json()
+    assert len(ids) == 3
+    stored = {row.id: row for row in db.query(Address)}
+    assert [stored[address_id].city for address_id in ids] == ["A", "B", "C"]
+
+
+def test_bulk_create_stores_derived_coordinates(client, db):
+    [address_id] = client.post(BULK_URL, json=[address("A", 48.8566, 2.3522)]).json()
+
+    row = db.get(Address, address_id)
+    assert (row.lat_e7, row.lon_e7) == (to_e7(48.8566), to_e7(2.3522))
+    assert (row.x, row.y, row.z) == pytest.approx(unit_vector(48.8566, 2.3522))
+
+
+def test_bulk_created_addresses_are_found_nearby(client):
+    ids = client.post(BULK_URL, json=[address("A", 1.0, 1.0), address("B", 1.001, 1.0)]).json()
+
+    response = client.get("/api/v1/addresses/nearby", params={"lat": 1.0, "lon": 1.0, "radius_km": 1})
+
+    assert [found["id"] for found in response.json()] == ids
+
+
+def test_bulk_create_of_nothing(client):
+    response = client.post(BULK_URL, json=[])
+
+    assert response.status_code == 201
+    assert response.json() == []
+
+
+def test_bulk_create_rejects_the_batch_if_any_address_is_invalid(client, db):
+    response = client.post(BULK_URL, json=[address("A", 1.0, 1.0), address("B", 91.0, 1.0)])
+
+    assert response.status_code == 422
+    assert db.query(Address).count() == 0
+
+
+def test_bulk_create_invalidates_cached_lists(cached_client):
+    assert cached_client.get("/api/v1/addresses").json() == []
+
+    cached_client.post(BULK_URL, json=[address("A", 1.0, 1.0)])
+
+    assert [found["city"] for found in cached_client.get("/api/v1/addresses").json()] == ["A"]
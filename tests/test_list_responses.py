@@ -0,0 +1,74 @@
+from app.models.address import AddressResponse
+
+ADDRESSES_URL = "/api/v1/addresses"
+ADDRESS = {
+    "street": "1 Main St",
+    "city": "City",
+    "state": None,
+    "country": "Country",
+    "postal_code": "12345",
+    "latitude": 1.0,
+    "longitude": 1.0,
+}
+
+
+def create_addresses(client, count):
+    return [
+        client.post(ADDRESSES_URL, json={**ADDRESS, "street": f"{i} Main St"}).json()
+        for i in range(count)
+    ]
+
+
+def test_list_body_matches_the_address_response_model(client):
+    created = create_addresses(client, 2)
+
+    response = client.get(ADDRESSES_URL)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == created
+    for address in response.json():
+        assert AddressResponse.model_validate(address).model_dump(mode="json") == address
+
+
+def test_list_pagination(client):
+    created = create_addresses(client, 5)
+
+    response = client.get(ADDRESSES_URL, params={"skip": 1, "limit": 3})
+
+    assert [address["id"] for address in response.json()] == [address["id"] for address in created[1:4]]
+
+
+def test_empty_list(client):
+    response = client.get(ADDRESSES_URL)
+
+    assert response.status_code == 200
+    assert response.content == b"[]"
+
+
+def test_cached_list_body_is_the_same(client, cached_client):
+    created = create_addresses(cached_client, 2)
+
+    first = cached_client.get(ADDRESSES_URL)
+    second = cached_client.get(ADDRESSES_URL)
+
+    assert first.json() == second.json() == created
+    assert second.headers["content-type"] == "application/json"
+
+
+def test_nearby_body_adds_the_distance(client):
+    [created] = create_addresses(client, 1)
+
+    response = client.get(f"{ADDRESSES_URL}/nearby", params={"lat": 1.0, "lon": 1.0, "radius_km": 1})
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == [{**created, "distance_km": 0.0}]
+
+
+def test_openapi_documents_the_list_response_models(client):
+    paths = client.get("/openapi.json").json()["paths"]
+
+    list_schema = paths[ADDRESSES_URL]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    nearby_schema = paths[f"{ADDRESSES_URL}/nearby"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert list_schema["items"]["$ref"].endswith("/AddressResponse")
+    assert nearby_schema["items"]["$ref"].endswith("/AddressWithDistance")
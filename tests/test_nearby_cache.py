@@ -0,0 +1,94 @@
+import pytest
+
+from tests.conftest import cache_keys
+
+NEARBY_URL = "/api/v1/addresses/nearby"
+PARIS = {"street": "Place de l'Hotel de Ville", "city": "Paris", "country": "France"}
+
+
+def create(client, latitude, longitude):
+    response = client.post(
+        "/api/v1/addresses", json={**PARIS, "latitude": latitude, "longitude": longitude}
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def nearby(client, lat, lon, radius_km, **params):
+    response = client.get(NEARBY_URL, params={"lat": lat, "lon": lon, "radius_km": radius_km, **params})
+    assert response.status_code == 200
+    return [(address["id"], address["distance_km"]) for address in response.json()]
+
+
+@pytest.fixture(params=["uncached", "cached"])
+def any_client(request):
+    return request.getfixturevalue(f"{request.param}_client")
+
+
+@pytest.fixture
+def uncached_client(client):
+    return client
+
+
+def test_distances_are_measured_from_the_exact_reference_point(any_client):
+    address_id = create(any_client, 48.8566, 2.3522)
+
+    assert nearby(any_client, 48.8566, 2.3522, 0.03) == [(address_id, 0.0)]
+    assert nearby(any_client, 48.8566, 2.3522, 0.1) == [(address_id, 0.0)]
+
+
+def test_requests_sharing_a_cache_entry_get_their_own_results(cached_client):
+    # About 0.56 km north of the reference point
+    address_id = create(cached_client, 10.005, 10.0)
+
+    assert nearby(cached_client, 10.0, 10.0, 0.74) == [(address_id, 0.56)]
+    assert nearby(cached_client, 10.0, 10.0, 0.26) == []
+    # Same grid cell as above, a little closer to the address
+    assert nearby(cached_client, 10.0004, 10.0, 0.74) == [(address_id, 0.51)]
+    assert nearby(cached_client, 10.0004, 10.0, 0.52) == [(address_id, 0.51)]
+    assert nearby(cached_client, 10.0004, 10.0, 0.5) == []
+
+
+def test_candidates_cover_the_whole_grid_cell(cached_client):
+    # 0.54 km from the centre of the cell, so outside the 0.5 km step
+    address_id = create(cached_client, 1.00489, 1.0)
+    assert nearby(cached_client, 1.0, 1.0, 0.5) == []
+
+    # Within 0.5 km of a point near the edge of the same cell
+    assert nearby(cached_client, 1.00049, 1.0, 0.5) == [(address_id, 0.49)]
+
+
+def test_cache_keys_are_per_cell_and_radius_step(cached_client):
+    create(cached_client, 1.0, 1.0)
+
+    nearby(cached_client, 1.0001, 1.0001, 0.3)
+    nearby(cached_client, 0.9999, 1.0002, 0.5, limit=1)
+    nearby(cached_client, 1.0, 1.0, 0.51)
+
+    assert [key for key in cache_keys() if ":nearby:" in key] == [
+        "addrbook:addresses:nearby:lat=1.000:lon=1.000:r=0.5",
+        "addrbook:addresses:nearby:lat=1.000:lon=1.000:r=1.0",
+    ]
+
+
+def test_limit_applies_after_ranking_by_exact_distance(any_client):
+    far = create(any_client, 1.002, 1.0)
+    near = create(any_client, 1.001, 1.0)
+
+    assert [address_id for address_id, _ in nearby(any_client, 1.0, 1.0, 1)] == [near, far]
+    assert [address_id for address_id, _ in nearby(any_client, 1.0, 1.0, 1, limit=1)] == [near]
+
+
+def test_writes_invalidate_cached_candidates(cached_client):
+    address_id = create(cached_client, 1.0, 1.0)
+    assert nearby(cached_client, 1.0, 1.0, 1) == [(address_id, 0.0)]
+
+    other_id = create(cached_client, 1.001, 1.0)
+    assert [address_id for address_id, _ in nearby(cached_client, 1.0, 1.0, 1)] == [address_id, other_id]
+
+    response = cached_client.put(f"/api/v1/addresses/{other_id}", json={"latitude": 5.0})
+    assert response.status_code == 200
+    assert nearby(cached_client, 1.0, 1.0, 1) == [(address_id, 0.0)]
+
+    assert cached_client.delete(f"/api/v1/addresses/{address_id}").status_code == 204
+    assert nearby(cached_client, 1.0, 1.0, 1) == []
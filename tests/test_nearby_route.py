@@ -0,0 +1,54 @@
+import pytest
+
+NEARBY_URL = "/api/v1/addresses/nearby"
+
+
+@pytest.fixture
+def address_id(client):
+    response = client.post(
+        "/api/v1/addresses",
+        json={"street": "1 Main St", "city": "City", "country": "Country", "latitude": 1.0, "longitude": 1.0}
+    )
+    return response.json()["id"]
+
+
+def test_nearby_is_served_before_the_address_id_route(client, address_id):
+    response = client.get(NEARBY_URL, params={"lat": 1.0, "lon": 1.0, "radius_km": 1})
+
+    assert response.status_code == 200
+    [address] = response.json()
+    assert address["id"] == address_id
+    assert address["distance_km"] == 0.0
+    assert client.get(f"/api/v1/addresses/{address_id}").json()["id"] == address_id
+
+
+def test_nearby_responses_are_cacheable_by_intermediaries(client, address_id):
+    response = client.get(NEARBY_URL, params={"lat": 1.0, "lon": 1.0, "radius_km": 1})
+
+    assert response.headers["cache-control"] == "public, max-age=30"
+
+
+def test_nearby_no_longer_accepts_post(client):
+    response = client.post(NEARBY_URL, json={"latitude": 1.0, "longitude": 1.0, "radius_km": 1})
+
+    assert response.status_code == 405
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"lon": 1.0, "radius_km": 1},
+        {"lat": 91, "lon": 1.0, "radius_km": 1},
+        {"lat": 1.0, "lon": -181, "radius_km": 1},
+        {"lat": 1.0, "lon": 1.0, "radius_km": 0},
+        {"lat": 1.0, "lon": 1.0, "radius_km": 1, "limit": 0},
+    ]
+)
+def test_nearby_validates_query_parameters(client, params):
+    assert client.get(NEARBY_URL, params=params).status_code == 422
+
+
+def test_nearby_parameters_are_documented(client):
+    parameters = client.get("/openapi.json").json()["paths"][NEARBY_URL]["get"]["parameters"]
+
+    assert [parameter["name"] for parameter in parameters] == ["lat", "lon", "radius_km", "limit"]
@@ -0,0 +1,89 @@
+import math
+import random
+
+import pytest
+
+from app.crud import address as crud
+from app.crud.address import EARTH_RADIUS_KM
+from app.db.address_table import address_table
+from tests.conftest import make_address
+
+QUERIES = [
+    (48.85, 2.35, 20),
+    (48.85, 2.35, 60),
+    (0, 180, 50),
+    (0, -179.95, 30),
+    (89.9, 0, 500),
+    (-89.5, 30, 200),
+    (10, 10, 20000),
+    (-45, 100, 1),
+]
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    h = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+@pytest.fixture
+def addresses(db):
+    rng = random.Random(1)
+    points = []
+    for i in range(400):
+        if i % 4 == 0:
+            point = (48.85 + rng.uniform(-0.5, 0.5), 2.35 + rng.uniform(-0.5, 0.5))
+        elif i % 4 == 1:
+            point = (rng.uniform(-10, 10), rng.choice([179.9, -179.9]) + rng.uniform(-0.09, 0.09))
+        elif i % 4 == 2:
+            point = (rng.choice([89.0, -89.0]) + rng.uniform(-1, 1), rng.uniform(-180, 180))
+        else:
+            point = (rng.uniform(-90, 90), rng.uniform(-180, 180))
+        points.append(point)
+    db.add_all([make_address(*point) for point in points])
+    db.commit()
+    address_table.load(db)
+    yield
+    address_table.loaded = False
+
+
+def search(db, latitude, longitude, radius_km, limit=None):
+    return [
+        (address.id, distance)
+        for address, distance in crud.get_addresses_within_radius(
+            db, latitude, longitude, radius_km, limit
+        )
+    ]
+
+
+@pytest.mark.parametrize("latitude, longitude, radius_km", QUERIES)
+@pytest.mark.parametrize("limit", [None, 5])
+def test_in_memory_and_sql_paths_return_the_same_rows(
+        db, addresses, monkeypatch, latitude, longitude, radius_km, limit
+):
+    in_memory = search(db, latitude, longitude, radius_km, limit)
+    monkeypatch.setattr(address_table, "loaded", False)
+    in_sql = search(db, latitude, longitude, radius_km, limit)
+
+    memory_ids, memory_distances = zip(*in_memory) if in_memory else ((), ())
+    sql_ids, sql_distances = zip(*in_sql) if in_sql else ((), ())
+    assert memory_ids == sql_ids
+    assert memory_distances == pytest.approx(sql_distances)
+
+
+@pytest.mark.parametrize("latitude, longitude, radius_km", QUERIES)
+def test_results_match_a_brute_force_search(db, addresses, latitude, longitude, radius_km):
+    expected = {
+        address.id
+        for address in db.query(crud.Address)
+        if haversine(latitude, longitude, address.latitude, address.longitude) <= radius_km
+    }
+
+    results = search(db, latitude, longitude, radius_km)
+
+    assert {address_id for address_id, _ in results} == expected
+    distances = [distance for _, distance in results]
+    assert distances == sorted(distances)
@@ -0,0 +1,74 @@
+from app.schemas.address import Address
+from tests.conftest import cache_keys
+
+ADDRESSES_URL = "/api/v1/addresses"
+ADDRESS = {"street": "1 Main St", "city": "City", "country": "Country", "latitude": 1.0, "longitude": 1.0}
+
+
+def rename_behind_the_apis_back(db, address_id, city):
+    db.get(Address, address_id).city = city
+    db.commit()
+
+
+def test_reads_are_served_from_the_cache(cached_client, db):
+    address_id = cached_client.post(ADDRESSES_URL, json=ADDRESS).json()["id"]
+    cached_client.get(ADDRESSES_URL)
+    cached_client.get(f"{ADDRESSES_URL}/{address_id}")
+
+    rename_behind_the_apis_back(db, address_id, "Renamed")
+
+    assert cached_client.get(ADDRESSES_URL).json()[0]["city"] == "City"
+    assert cached_client.get(f"{ADDRESSES_URL}/{address_id}").json()["city"] == "City"
+    assert cache_keys() == [
+        f"addrbook:addresses:id={address_id}",
+        "addrbook:addresses:list:skip=0:limit=100",
+    ]
+
+
+def test_create_invalidates_cached_reads(cached_client):
+    assert cached_client.get(ADDRESSES_URL).json() == []
+
+    cached_client.post(ADDRESSES_URL, json=ADDRESS)
+
+    assert len(cached_client.get(ADDRESSES_URL).json()) == 1
+
+
+def test_update_invalidates_cached_reads(cached_client):
+    address_id = cached_client.post(ADDRESSES_URL, json=ADDRESS).json()["id"]
+    cached_client.get(ADDRESSES_URL)
+    cached_client.get(f"{ADDRESSES_URL}/{address_id}")
+
+    cached_client.put(f"{ADDRESSES_URL}/{address_id}", json={"city": "Renamed"})
+
+    assert cached_client.get(ADDRESSES_URL).json()[0]["city"] == "Renamed"
+    assert cached_client.get(f"{ADDRESSES_URL}/{address_id}").json()["city"] == "Renamed"
+
+
+def test_delete_invalidates_cached_reads(cached_client):
+    address_id = cached_client.post(ADDRESSES_URL, json=ADDRESS).json()["id"]
+    cached_client.get(ADDRESSES_URL)
+    cached_client.get(f"{ADDRESSES_URL}/{address_id}")
+
+    cached_client.delete(f"{ADDRESSES_URL}/{address_id}")
+
+    assert cached_client.get(ADDRESSES_URL).json() == []
+    assert cached_client.get(f"{ADDRESSES_URL}/{address_id}").status_code == 404
+
+
+def test_pages_are_cached_separately(cached_client):
+    for city in ("A", "B", "C"):
+        cached_client.post(ADDRESSES_URL, json={**ADDRESS, "city": city})
+
+    first = cached_client.get(ADDRESSES_URL, params={"limit": 2}).json()
+    second = cached_client.get(ADDRESSES_URL, params={"skip": 2, "limit": 2}).json()
+
+    assert [address["city"] for address in first + second] == ["A", "B", "C"]
+
+
+def test_nothing_is_cached_when_caching_is_disabled(client, db):
+    address_id = client.post(ADDRESSES_URL, json=ADDRESS).json()["id"]
+    client.get(ADDRESSES_URL)
+
+    rename_behind_the_apis_back(db, address_id, "Renamed")
+
+    assert client.get(ADDRESSES_URL).json()[0]["city"] == "Renamed"